@@ -1,8 +1,14 @@
 """AIOC hardware interface: audio I/O, PTT control, VOX recording."""
 
+import ctypes
+import math
+import os
+import queue
+import sys
 import threading
 import time
 import logging
+from typing import Iterable
 
 import numpy as np
 import sounddevice as sd
@@ -14,6 +20,11 @@ logger = logging.getLogger(__name__)
 AIOC_VID = 0x1209
 AIOC_PID = 0x7388
 
+PTT_SETTLE_SEC = 0.3  # let TX relay + CTCSS settle before audio
+
+QOS_CLASS_USER_INTERACTIVE = 0x21  # macOS <sys/qos.h>
+REALTIME_PRIORITY = 80             # Linux SCHED_FIFO priority (1-99)
+
 
 class AIOC:
     """AIOC cable interface: audio device discovery + PTT via serial DTR/RTS."""
@@ -108,13 +119,15 @@ class AIOC:
     # --- PTT Control ---
 
     def ptt_on(self):
-        """Key transmitter: DTR=True, RTS=False."""
+        """
+        Key transmitter: DTR=True, RTS=False. Returns immediately; audio must
+        start with PTT_SETTLE_SEC of silence (see play_chunks preroll_sec).
+        """
         if self.dry_run or not self.serial_port:
             logger.debug("[DRY RUN] PTT ON")
             return
         self.serial_port.dtr = True
         self.serial_port.rts = False
-        time.sleep(0.3)  # let TX relay + CTCSS settle
 
     def ptt_off(self):
         """Unkey transmitter: DTR=False, RTS=True."""
@@ -131,11 +144,23 @@ class VOXRecorder:
     def __init__(self, aioc: AIOC, config: dict):
         self.aioc = aioc
         self.threshold_dbfs = config["vox"]["threshold_dbfs"]
+        # Same threshold as a mean-square power, so the callback needs no log10
+        self._thresh_sq = 10.0 ** (self.threshold_dbfs / 10.0)
         self.hang_time = config["vox"]["hang_time_sec"]
         self.min_duration = config["vox"]["min_transmission_sec"]
         self.max_duration = config["vox"]["max_transmission_sec"]
+        self.blocksize = config["vox"].get("blocksize", 256)
+        self.latency = config["vox"].get("latency", "low")
+        self.realtime = config["vox"].get("realtime", False)
         self.sample_rate = aioc.sample_rate
         self.channels = aioc.channels
+        # Preallocated recording buffer (max length + block slack), reused
+        # across transmissions so the audio callback never allocates
+        self._buf = np.empty(
+            (int(self.max_duration * self.sample_rate) + max(self.blocksize, 2048),
+             self.channels or 1),
+            dtype=np.float32,
+        )
         self._stop = threading.Event()
         self._muted = threading.Event()  # set = muted (ignore audio)
 
@@ -157,26 +182,30 @@ class VOXRecorder:
         Returns None if too short (noise burst). Returns float32 numpy array.
         """
         self._muted.clear()  # ensure unmuted at start of each listen cycle
-        frames: list[np.ndarray] = []
+        write_pos = 0
         recording = False
         last_above = 0.0
         done_event = threading.Event()
         max_frames = int(self.max_duration * self.sample_rate)
-        total_frames = 0
         last_level_log = [0.0]  # mutable for closure
+        boosted = [False]
 
         def callback(indata, frame_count, time_info, status):
-            nonlocal recording, last_above, total_frames
+            nonlocal recording, last_above, write_pos
+            # PortAudio owns this thread, so it can only be boosted from inside
+            if self.realtime and not boosted[0]:
+                boosted[0] = True
+                boost_current_thread()
             if status:
                 logger.debug(f"Audio status: {status}")
 
-            level = rms_dbfs(indata)
+            mean_sq = mean_square(indata)
             now = time.monotonic()
 
             # Log level periodically so we can diagnose threshold issues
             if now - last_level_log[0] > 2.0:
                 logger.debug(
-                    f"Audio level: {level:.1f} dBFS "
+                    f"Audio level: {power_dbfs(mean_sq):.1f} dBFS "
                     f"(threshold: {self.threshold_dbfs} dBFS) "
                     f"{'[RECORDING]' if recording else ''}"
                 )
@@ -185,21 +214,19 @@ class VOXRecorder:
             if self._muted.is_set():
                 return
 
-            if level >= self.threshold_dbfs:
+            if mean_sq >= self._thresh_sq:
                 last_above = now
                 if not recording:
                     recording = True
-                    logger.info(f"VOX open ({level:.1f} dBFS)")
-                frames.append(indata.copy())
-                total_frames += frame_count
+                    logger.info(f"VOX open ({power_dbfs(mean_sq):.1f} dBFS)")
+                write_pos = _buffer_append(self._buf, write_pos, indata)
             elif recording:
-                frames.append(indata.copy())
-                total_frames += frame_count
+                write_pos = _buffer_append(self._buf, write_pos, indata)
                 if (now - last_above) > self.hang_time:
                     logger.info("VOX closed (hang time expired)")
                     done_event.set()
 
-            if total_frames >= max_frames:
+            if write_pos >= max_frames:
                 logger.warning("Max recording length reached")
                 done_event.set()
 
@@ -208,7 +235,8 @@ class VOXRecorder:
             channels=self.channels,
             device=self.aioc.input_device,
             dtype="float32",
-            blocksize=1024,
+            blocksize=self.blocksize,
+            latency=self.latency,
             callback=callback,
         )
 
@@ -217,10 +245,11 @@ class VOXRecorder:
             while not done_event.is_set() and not self._stop.is_set():
                 done_event.wait(timeout=0.5)
 
-        if not frames:
+        if write_pos == 0:
             return None
 
-        audio = np.concatenate(frames, axis=0).squeeze()
+        # Copy out: the buffer is reused on the next listen cycle
+        audio = self._buf[:write_pos].copy().squeeze()
         duration = len(audio) / self.sample_rate
 
         if duration < self.min_duration:
@@ -231,24 +260,117 @@ class VOXRecorder:
         return audio
 
 
+def boost_current_thread():
+    """
+    Best-effort scheduling boost for the calling (audio callback) thread:
+    QoS user-interactive on macOS, SCHED_FIFO on Linux. Failure is logged
+    and otherwise ignored.
+    """
+    try:
+        if sys.platform == "darwin":
+            libc = ctypes.CDLL(None, use_errno=True)
+            ret = libc.pthread_set_qos_class_self_np(QOS_CLASS_USER_INTERACTIVE, 0)
+            if ret != 0:
+                raise OSError(ret, os.strerror(ret))
+        elif hasattr(os, "sched_setscheduler"):
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(REALTIME_PRIORITY))
+        else:
+            return
+        logger.info("Audio callback thread priority raised")
+    except OSError as e:
+        logger.warning(f"Could not raise audio thread priority: {e}")
+
+
+def _buffer_append(buf: np.ndarray, pos: int, block: np.ndarray) -> int:
+    """Copy block into buf at pos (truncating at capacity), return new write position."""
+    n = min(len(block), len(buf) - pos)
+    np.copyto(buf[pos:pos + n], block[:n])
+    return pos + n
+
+
+def mean_square(block: np.ndarray) -> float:
+    """Mean-square power of a float32 audio block (linear, full scale = 1.0)."""
+    # Single BLAS dot on the native float32 buffer — no float64 temporary
+    flat = np.ascontiguousarray(block).ravel()
+    return float(np.dot(flat, flat)) / flat.size
+
+
+def power_dbfs(mean_sq: float) -> float:
+    """Convert mean-square power to dBFS (floored at -100)."""
+    if mean_sq < 1e-20:
+        return -100.0
+    return 10.0 * math.log10(mean_sq)
+
+
 def rms_dbfs(block: np.ndarray) -> float:
     """Compute RMS level in dBFS from a float32 audio block."""
-    rms = np.sqrt(np.mean(block.astype(np.float64) ** 2))
-    if rms < 1e-10:
-        return -100.0
-    return 20.0 * np.log10(rms)
+    return power_dbfs(mean_square(block))
+
+
+def play_chunks(chunks: Iterable[np.ndarray], sample_rate: int, aioc: AIOC,
+                preroll_sec: float = 0.0, realtime: bool = False) -> np.ndarray:
+    """
+    Play int16 chunks through AIOC output as they are produced (blocking).
+    Playback starts with the first chunk while later ones are still being
+    generated. preroll_sec of leading silence is played first (not included
+    in the return value). With realtime, the callback thread is boosted as in
+    VOXRecorder. Returns everything played, for logging.
+    """
+    pending: queue.Queue[np.ndarray | None] = queue.Queue()
+    if preroll_sec > 0:
+        pending.put(np.zeros(int(preroll_sec * sample_rate), dtype=np.int16))
+    current = [np.empty(0, dtype=np.int16)]
+    pos = [0]
+    finished = threading.Event()
+    boosted = [False]
+
+    def callback(outdata, frame_count, time_info, status):
+        if realtime and not boosted[0]:
+            boosted[0] = True
+            boost_current_thread()
+        if status:
+            logger.debug(f"Audio status: {status}")
+        written = 0
+        while written < frame_count:
+            if pos[0] >= len(current[0]):
+                try:
+                    nxt = pending.get_nowait()
+                except queue.Empty:
+                    outdata[written:] = 0  # producer behind: pad with silence
+                    return
+                if nxt is None:
+                    outdata[written:] = 0
+                    raise sd.CallbackStop
+                current[0], pos[0] = nxt, 0
+            n = min(frame_count - written, len(current[0]) - pos[0])
+            outdata[written:written + n] = current[0][pos[0]:pos[0] + n, np.newaxis]
+            pos[0] += n
+            written += n
+
+    stream = sd.OutputStream(
+        samplerate=sample_rate,
+        channels=aioc.channels,
+        device=aioc.output_device,
+        dtype="int16",
+        callback=callback,
+        finished_callback=finished.set,
+    )
 
+    played: list[np.ndarray] = []
+    with stream:
+        for chunk in chunks:
+            played.append(chunk)
+            pending.put(chunk)
+        pending.put(None)
+        finished.wait()
 
-def play_audio(audio: np.ndarray, sample_rate: int, aioc: AIOC):
-    """Play audio through AIOC output (blocking)."""
-    sd.play(audio, samplerate=sample_rate, device=aioc.output_device)
-    sd.wait()
+    if not played:
+        return np.array([], dtype=np.int16)
+    return np.concatenate(played)
 
 
-def monitor_levels(aioc: AIOC):
+def monitor_levels(aioc: AIOC, blocksize: int = 256, latency: str | float = "low"):
     """Print live audio levels from the input device. Ctrl+C to stop."""
-    import sys
-
     last_print = [0.0]
     peak = [-100.0]
 
@@ -256,7 +378,7 @@ def monitor_levels(aioc: AIOC):
         level = rms_dbfs(indata)
         peak[0] = max(peak[0], level)
         now = time.monotonic()
-        if now - last_print[0] < 0.2:  # update 5x/sec, not 47x
+        if now - last_print[0] < 0.2:  # update 5x/sec, not every block
             return
         last_print[0] = now
         bar_len = max(0, int((level + 60) * 1.5))
@@ -271,7 +393,8 @@ def monitor_levels(aioc: AIOC):
         channels=aioc.channels,
         device=aioc.input_device,
         dtype="float32",
-        blocksize=1024,
+        blocksize=blocksize,
+        latency=latency,
         callback=callback,
     )
     print("Speak into mic — watch the levels. Ctrl+C to stop.\n", flush=True)
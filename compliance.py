@@ -4,6 +4,13 @@ import re
 import time
 import logging
 
+import ahocorasick
+
+try:
+    import hyperscan
+except ImportError:  # optional — fall back to the stdlib regex engine
+    hyperscan = None
+
 logger = logging.getLogger(__name__)
 
 # Phonetic alphabet (ITU/NATO)
@@ -34,6 +41,45 @@ BLOCKED_PATTERNS = [
 
 BLOCKED_RE = re.compile("|".join(BLOCKED_PATTERNS), re.IGNORECASE)
 
+REDACTED = "[REDACTED]"
+
+
+def _compile_blocked_db():
+    """
+    Compile BLOCKED_PATTERNS into a Hyperscan prefilter database.
+    Hyperscan rejects word boundaries in Unicode (UCP) mode, so the patterns
+    are compiled as a prefilter: a cheap superset test whose hits re confirms.
+    """
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[p.encode() for p in BLOCKED_PATTERNS],
+        ids=list(range(len(BLOCKED_PATTERNS))),
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP
+               | hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_SINGLEMATCH]
+        * len(BLOCKED_PATTERNS),
+    )
+    return db
+
+
+_BLOCKED_DB = _compile_blocked_db() if hyperscan is not None else None
+
+
+def redact_blocked(text: str) -> str:
+    """Replace every blocked span in text with [REDACTED]."""
+    if _BLOCKED_DB is not None:
+        hit = [False]
+
+        def on_match(id_, start, end, flags, context):
+            hit[0] = True
+
+        _BLOCKED_DB.scan(text.encode(), match_event_handler=on_match)
+        if not hit[0]:
+            return text  # common case: clean text never touches re
+
+    # re does the redaction so output never depends on hyperscan being installed
+    return BLOCKED_RE.sub(REDACTED, text)
+
+
 # Emergency keywords — do not interfere
 EMERGENCY_WORDS = ["mayday", "emergency", "break break", "pan pan"]
 
@@ -51,6 +97,9 @@ class ComplianceManager:
         self.id_interval = config["id_interval_sec"]
         self.last_id_time = 0.0  # force ID on first transmission
         self._shutdown = False
+        # Callsign is fixed for the run, so the ID announcement is too
+        self._id_text = f"This is {phonetic_callsign(self.callsign)}, automated station."
+        self._keywords = self._build_keyword_automaton()
 
     # --- Station Identification (§97.119) ---
 
@@ -60,7 +109,7 @@ class ComplianceManager:
 
     def get_id_text(self) -> str:
         """Station identification announcement text."""
-        return f"This is {phonetic_callsign(self.callsign)}, automated station."
+        return self._id_text
 
     def mark_id_sent(self):
         """Record that a station ID was just transmitted."""
@@ -71,7 +120,7 @@ class ComplianceManager:
 
     def filter_response(self, text: str) -> str:
         """Remove blocked content from LLM output."""
-        filtered = BLOCKED_RE.sub("[REDACTED]", text)
+        filtered = redact_blocked(text)
         if filtered != text:
             logger.warning(f"Content filtered: {text!r} -> {filtered!r}")
         return filtered
@@ -88,20 +137,24 @@ class ComplianceManager:
         if len(text) < 3:
             return False
 
+        # Single pass over the text for emergency + shutdown phrases
+        kinds = {kind for _, (kind, _) in self._keywords.iter(text)}
+
         # Emergency traffic — stand by, do not interfere
-        if any(w in text for w in EMERGENCY_WORDS):
+        if "emergency" in kinds:
             logger.warning(f"Emergency traffic detected: {text!r} — standing by.")
             return False
 
         # Shutdown command from control operator
-        if self._is_shutdown_command(text):
+        if "shutdown" in kinds:
             logger.critical("SHUTDOWN COMMAND RECEIVED")
             self._shutdown = True
             return False
 
         return True
 
-    def _is_shutdown_command(self, text: str) -> bool:
+    def _build_keyword_automaton(self) -> ahocorasick.Automaton:
+        """Aho-Corasick automaton over emergency words and shutdown phrases."""
         cs = self.callsign.lower()
         shutdown_phrases = [
             f"{cs} shut down",
@@ -109,7 +162,13 @@ class ComplianceManager:
             f"{cs} go silent",
             f"{cs} cease operations",
         ]
-        return any(phrase in text for phrase in shutdown_phrases)
+        automaton = ahocorasick.Automaton()
+        for word in EMERGENCY_WORDS:
+            automaton.add_word(word, ("emergency", word))
+        for phrase in shutdown_phrases:
+            automaton.add_word(phrase, ("shutdown", phrase))
+        automaton.make_automaton()
+        return automaton
 
     @property
     def is_shutdown(self) -> bool:
@@ -3,7 +3,7 @@
 import logging
 import re
 
-from ollama import chat as ollama_chat
+from ollama import ResponseError, chat as ollama_chat
 import warnings
 with warnings.catch_warnings():
     warnings.simplefilter("ignore")
@@ -11,19 +11,28 @@ with warnings.catch_warnings():
 
 logger = logging.getLogger(__name__)
 
-# Keywords suggesting a web search would help answer the question
-SEARCH_TRIGGERS = [
-    "what is", "what are", "what's the", "who is", "who was",
-    "when did", "when was", "when is",
-    "where is", "where do", "where can",
-    "how to", "how do", "how does", "how many", "how much",
-    "which", "what frequency", "what band", "what mode",
-    "latest", "current", "today", "news", "weather", "forecast",
-    "look up", "search for", "find out", "tell me about",
-    "temperature", "score", "result", "update",
-    "ft8", "ft4", "wspr", "aprs", "dmr", "d-star",
-    "propagation", "solar", "sunspot", "sfi", "kp index",
-]
+# Tool the model can call when it needs facts it doesn't have
+WEB_SEARCH_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "web_search",
+        "description": (
+            "Search the web for current or factual information (news, weather, "
+            "propagation, frequencies, specs). Only call this when you do not "
+            "already know the answer."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "Search query"},
+            },
+            "required": ["query"],
+        },
+    },
+}
+
+# <think>...</think> blocks from reasoning models (qwen3, deepseek-r1, etc.)
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
 
 
 class LLM:
@@ -33,6 +42,11 @@ class LLM:
         self.temperature = config["llm"]["temperature"]
         self.search_enabled = config["search"]["enabled"]
         self.max_search_results = config["search"]["max_results"]
+        self.search_timeout = config["search"].get("timeout_sec", 5)
+
+        # One client for the whole run keeps the HTTPS connection warm
+        self._ddgs = DDGS(timeout=self.search_timeout) if self.search_enabled else None
+        self._use_tools = self.search_enabled  # cleared if the model rejects tools
 
         self.system_prompt = config["llm"]["system_prompt"].format(
             callsign=config["callsign"]
@@ -40,13 +54,20 @@ class LLM:
         self.messages: list[dict] = [{"role": "system", "content": self.system_prompt}]
         self.max_history = 10  # user/assistant pairs to keep
 
-    def _needs_search(self, text: str) -> bool:
-        text_lower = text.lower()
-        return any(trigger in text_lower for trigger in SEARCH_TRIGGERS)
+    def warmup(self):
+        """Have Ollama load the model into memory with a one-token request."""
+        try:
+            ollama_chat(
+                model=self.model,
+                messages=[{"role": "user", "content": "hi"}],
+                options={"num_predict": 1},
+            )
+        except Exception as e:
+            logger.warning(f"Ollama warmup failed: {e}")
 
     def _web_search(self, query: str) -> str:
         try:
-            results = DDGS().text(query, max_results=self.max_search_results)
+            results = self._ddgs.text(query, max_results=self.max_search_results)
             if not results:
                 return ""
             return "\n".join(f"- {r['title']}: {r['body']}" for r in results)
@@ -54,46 +75,70 @@ class LLM:
             logger.warning(f"Web search failed: {e}")
             return ""
 
-    def respond(self, user_text: str) -> str:
-        """Generate a response, optionally augmented with web search results."""
-        # Web search if warranted
-        search_context = ""
-        if self.search_enabled and self._needs_search(user_text):
-            logger.info(f"Searching: {user_text}")
-            search_context = self._web_search(user_text)
-
-        if search_context:
-            content = (
-                f"The user asked over radio: {user_text}\n\n"
-                f"Web search results:\n{search_context}\n\n"
-                f"Answer concisely using these results."
-            )
-        else:
-            content = user_text
+    def _run_tool(self, call) -> str:
+        name = call["function"]["name"]
+        if name != "web_search":
+            logger.warning(f"LLM requested unknown tool: {name}")
+            return f"Unknown tool: {name}"
+        query = call["function"]["arguments"].get("query", "")
+        logger.info(f"Searching: {query}")
+        return self._web_search(query) or "No results found."
+
+    def _chat(self, messages: list[dict], tools: list[dict] | None = None) -> tuple[str, list]:
+        """Stream one completion. Returns (content, tool_calls)."""
+        parts: list[str] = []
+        tool_calls = []
+        stream = ollama_chat(
+            model=self.model,
+            messages=messages,
+            tools=tools,
+            stream=True,
+            options={
+                "num_predict": self.max_tokens,
+                "temperature": self.temperature,
+            },
+        )
+        for chunk in stream:
+            parts.append(chunk["message"]["content"] or "")
+            tool_calls.extend(chunk["message"].get("tool_calls") or [])
+        return "".join(parts), tool_calls
 
+    def respond(self, user_text: str) -> str:
+        """Generate a response; the model may call web_search to augment it."""
         # Prepend /no_think to suppress qwen3 chain-of-thought reasoning
-        content = f"/no_think\n{content}"
-
-        self.messages.append({"role": "user", "content": content})
+        self.messages.append({"role": "user", "content": f"/no_think\n{user_text}"})
 
         # Trim history: keep system prompt + last N exchanges
         if len(self.messages) > (1 + self.max_history * 2):
             self.messages = [self.messages[0]] + self.messages[-(self.max_history * 2):]
 
-        # Stream response
-        full_response = ""
         try:
-            stream = ollama_chat(
-                model=self.model,
-                messages=self.messages,
-                stream=True,
-                options={
-                    "num_predict": self.max_tokens,
-                    "temperature": self.temperature,
-                },
-            )
-            for chunk in stream:
-                full_response += chunk["message"]["content"]
+            if self._use_tools:
+                try:
+                    full_response, tool_calls = self._chat(self.messages, [WEB_SEARCH_TOOL])
+                except ResponseError as e:
+                    # Model without tool support: retry plain and stop offering
+                    # tools for the rest of the run. Any other server error is
+                    # an ordinary per-turn failure.
+                    if e.status_code != 400 or "does not support tools" not in str(e.error):
+                        raise
+                    full_response, tool_calls = self._chat(self.messages)
+                    self._use_tools = False
+                    logger.warning(f"Model {self.model} rejected tools ({e}); web search disabled")
+            else:
+                full_response, tool_calls = self._chat(self.messages)
+            if tool_calls:
+                # Tool traffic lives only in this turn; history keeps Q and final A
+                turn = self.messages + [
+                    {"role": "assistant", "content": full_response, "tool_calls": tool_calls}
+                ]
+                for call in tool_calls:
+                    turn.append({
+                        "role": "tool",
+                        "tool_name": call["function"]["name"],
+                        "content": self._run_tool(call),
+                    })
+                full_response, _ = self._chat(turn)
         except Exception as e:
             logger.error(f"Ollama error: {e}")
             full_response = "Sorry, I had trouble generating a response."
@@ -101,8 +146,8 @@ class LLM:
         self.messages.append({"role": "assistant", "content": full_response})
         logger.info(f"LLM raw: {full_response!r}")
 
-        # Strip <think>...</think> blocks from reasoning models (qwen3, deepseek-r1, etc.)
-        cleaned = re.sub(r"<think>.*?</think>", "", full_response, flags=re.DOTALL).strip()
+        # Strip reasoning blocks
+        cleaned = _THINK_RE.sub("", full_response).strip()
         if cleaned != full_response.strip():
             logger.info(f"LLM cleaned: {cleaned!r}")
 
@@ -10,11 +10,13 @@ Usage:
 """
 
 import argparse
+import itertools
 import logging
 import os
 import signal
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Use cached models only — no network requests to HuggingFace
 os.environ.setdefault("HF_HUB_OFFLINE", "1")
@@ -23,7 +25,7 @@ import numpy as np
 import soundfile as sf
 import yaml
 
-from audio import AIOC, VOXRecorder, play_audio
+from audio import AIOC, PTT_SETTLE_SEC, VOXRecorder, play_chunks
 from compliance import ComplianceManager
 from llm import LLM
 from stt import STT
@@ -63,22 +65,32 @@ def transmit(aioc: AIOC, tts: TTS, text: str, log_dir: str | None = None,
              vox: VOXRecorder | None = None):
     """Synthesize text and transmit via AIOC. Mutes VOX to avoid self-trigger."""
     logger = logging.getLogger("main")
-    audio = tts.synthesize_for_radio(text, target_sr=aioc.sample_rate)
-    if len(audio) == 0:
+    chunks = tts.synthesize_for_radio(text, target_sr=aioc.sample_rate)
+
+    # Wait for the first chunk before keying up — no dead carrier while the
+    # model warms up. The rest is synthesized while earlier chunks play.
+    first = next(chunks, None)
+    if first is None:
         logger.error("TTS produced no audio, skipping transmission.")
         return
 
-    if log_dir:
-        save_wav(log_dir, "tx", audio, aioc.sample_rate)
-
     if vox:
         vox.mute()
 
-    duration = len(audio) / aioc.sample_rate
-    logger.info(f"TX ({duration:.1f}s): {text!r}")
+    logger.info(f"TX: {text!r}")
+    # Key up without blocking; the relay settles during the stream's leading
+    # silence, so the delay is taken by the sound card, not the wall clock
     aioc.ptt_on()
-    play_audio(audio, aioc.sample_rate, aioc)
-    aioc.ptt_off()
+    try:
+        audio = play_chunks(itertools.chain([first], chunks), aioc.sample_rate, aioc,
+                            preroll_sec=PTT_SETTLE_SEC,
+                            realtime=vox.realtime if vox else False)
+    finally:
+        aioc.ptt_off()
+    logger.info(f"TX done ({len(audio) / aioc.sample_rate:.1f}s)")
+
+    if log_dir:
+        save_wav(log_dir, "tx", audio, aioc.sample_rate)
 
     if vox:
         time.sleep(0.5)  # brief pause before resuming VOX
@@ -117,19 +129,37 @@ def main():
         logger.info("Monitor mode — showing audio levels. Ctrl+C to stop.")
         logger.info(f"Current VOX threshold: {config['vox']['threshold_dbfs']} dBFS")
         try:
-            monitor_levels(aioc)
+            monitor_levels(
+                aioc,
+                blocksize=config["vox"].get("blocksize", 256),
+                latency=config["vox"].get("latency", "low"),
+            )
         except KeyboardInterrupt:
             pass
         aioc.close()
         return
 
-    # --- Initialize ML modules (slow — loads models lazily) ---
+    # --- Initialize ML modules ---
     vox = VOXRecorder(aioc, config)
     stt = STT(config)
     tts = TTS(config)
     llm = LLM(config)
     compliance = ComplianceManager(config)
 
+    # Load models up front. STT and TTS share MLX's default stream, so they load
+    # one after the other; Ollama loads its model in its own process meanwhile.
+    logger.info("Loading models...")
+    try:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            llm_load = pool.submit(llm.warmup)
+            stt.warmup()
+            tts.warmup()
+            llm_load.result()
+    except Exception as e:
+        logger.exception(f"Fatal error loading models: {e}")
+        aioc.close()
+        sys.exit(1)
+
     # --- Graceful shutdown on Ctrl+C ---
     _signal_count = [0]
 
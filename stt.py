@@ -1,13 +1,17 @@
 """Speech-to-text via lightning-whisper-mlx (Apple Silicon optimized)."""
 
+import math
 import tempfile
 import logging
 
 import numpy as np
 import soundfile as sf
+from scipy.signal import resample_poly
 
 logger = logging.getLogger(__name__)
 
+WHISPER_SAMPLE_RATE = 16000  # Whisper consumes 16 kHz mono float32
+
 
 class STT:
     def __init__(self, config: dict):
@@ -27,15 +31,34 @@ class STT:
         )
         logger.info("STT model loaded.")
 
+    def warmup(self):
+        """Load the model now instead of on the first transcription."""
+        self._ensure_loaded()
+
     def transcribe(self, audio: np.ndarray, sample_rate: int) -> str:
         """Transcribe a float32 numpy audio array to text."""
         self._ensure_loaded()
 
-        # lightning-whisper-mlx expects a file path
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as f:
-            sf.write(f.name, audio, sample_rate)
-            result = self._model.transcribe(f.name)
+        # Hand Whisper the samples directly — no WAV round-trip through disk.
+        # File input is resampled by ffmpeg inside whisper; arrays are not.
+        try:
+            result = self._model.transcribe(_to_whisper_input(audio, sample_rate))
+        except Exception as e:
+            logger.warning(f"In-memory transcription failed ({e}), retrying via WAV file")
+            with tempfile.NamedTemporaryFile(suffix=".wav", delete=True) as f:
+                sf.write(f.name, audio, sample_rate)
+                result = self._model.transcribe(f.name)
 
         text = result.get("text", "").strip()
         logger.info(f"Transcription: {text!r}")
         return text
+
+
+def _to_whisper_input(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Downmix to mono and resample to 16 kHz float32."""
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    if sample_rate != WHISPER_SAMPLE_RATE:
+        g = math.gcd(sample_rate, WHISPER_SAMPLE_RATE)
+        audio = resample_poly(audio, WHISPER_SAMPLE_RATE // g, sample_rate // g)
+    return np.asarray(audio, dtype=np.float32)
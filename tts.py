@@ -1,10 +1,14 @@
 """Text-to-speech via Qwen3-TTS voice clone (mlx-audio on Apple Silicon)."""
 
 import json
+import math
 import os
 import logging
+from typing import Iterator
 
 import numpy as np
+import soundfile as sf
+from scipy.signal import resample_poly
 
 logger = logging.getLogger(__name__)
 
@@ -15,81 +19,154 @@ class TTS:
         self.language = config["tts"]["language"]
         self.speed = config["tts"]["speed"]
         self.tone = config["tts"]["tone"]
+        self.streaming_interval = config["tts"].get("streaming_interval_sec", 1.0)
         self.voice_dir = config["tts"]["voice_profile_dir"]
         self._model = None
-        self._ref_audio_path = None
+        self._ref_audio = None  # decoded once; mx.array at model rate after load
+        self._ref_sr = None
         self._ref_text = None
         self._load_voice_profile()
 
     def _load_voice_profile(self):
-        """Load reference audio path and transcript from voice profile."""
+        """Load reference audio and transcript from voice profile."""
         meta_path = os.path.join(self.voice_dir, "meta.json")
         with open(meta_path) as f:
             meta = json.load(f)
-        self._ref_audio_path = os.path.join(self.voice_dir, "audio.wav")
+        # Decode the reference WAV once rather than letting every generate()
+        # call re-read it from disk
+        audio, self._ref_sr = sf.read(os.path.join(self.voice_dir, "audio.wav"), dtype="float32")
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        self._ref_audio = audio
         self._ref_text = meta["transcript"]
         logger.info(f"Voice profile loaded: {meta['name']}")
 
     def _ensure_model(self):
         if self._model is not None:
             return
+        import mlx.core as mx
         from mlx_audio.tts.utils import load_model
 
         logger.info(f"Loading TTS model: {self.model_id} ...")
-        self._model = load_model(self.model_id)
+        model = load_model(self.model_id)
+
+        # Hand the model reference audio at its own rate, as its file loader would
+        ref = self._ref_audio
+        if self._ref_sr != model.sample_rate:
+            g = math.gcd(self._ref_sr, model.sample_rate)
+            ref = resample_poly(ref, model.sample_rate // g, self._ref_sr // g)
+        self._ref_audio = mx.array(ref.astype(np.float32, copy=False))
+        self._model = model
         logger.info("TTS model loaded.")
 
-    def synthesize(self, text: str) -> tuple[np.ndarray, int]:
+    def warmup(self):
+        """Load the model now instead of on the first synthesis."""
+        self._ensure_model()
+
+    def synthesize(self, text: str) -> Iterator[tuple[np.ndarray, int]]:
         """
         Convert text to speech using voice clone.
-        Returns (audio_float32, sample_rate).
+        Yields (audio_float32, sample_rate) chunks as the model produces them.
         """
         self._ensure_model()
 
         temperature = 0.3 + (self.tone / 100.0) * 0.7
         top_p = 0.8 + (self.tone / 100.0) * 0.2
 
-        audio_chunks = []
-        sample_rate = None
-
+        total_sec = 0.0
         for result in self._model.generate(
             text=text.strip(),
-            ref_audio=self._ref_audio_path,
+            ref_audio=self._ref_audio,
             ref_text=self._ref_text,
             lang_code=self.language,
             temperature=temperature,
             top_p=top_p,
             speed=self.speed,
             verbose=False,
+            # Decode audio every streaming_interval seconds of speech instead of
+            # once at the end, so transmission can start on the first chunk
+            stream=True,
+            streaming_interval=self.streaming_interval,
         ):
-            audio_chunks.append(np.array(result.audio))
-            if sample_rate is None:
-                sample_rate = result.sample_rate
+            chunk = np.array(result.audio)
+            if len(chunk) == 0:
+                continue
+            total_sec += len(chunk) / result.sample_rate
+            yield chunk, result.sample_rate
 
-        if not audio_chunks:
+        if total_sec == 0.0:
             logger.error("TTS returned no audio")
-            return np.array([], dtype=np.float32), 48000
-
-        audio = np.concatenate(audio_chunks)
-        logger.info(f"TTS: {len(audio)/sample_rate:.1f}s of audio for {len(text)} chars")
-        return audio, sample_rate
+            return
+        logger.info(f"TTS: {total_sec:.1f}s of audio for {len(text)} chars")
 
-    def synthesize_for_radio(self, text: str, target_sr: int = 48000) -> np.ndarray:
+    def synthesize_for_radio(self, text: str, target_sr: int = 48000) -> Iterator[np.ndarray]:
         """
-        Synthesize and convert to radio-ready int16 at target sample rate.
+        Synthesize and convert to radio-ready int16 chunks at target sample rate.
         """
-        audio, sr = self.synthesize(text)
-        if len(audio) == 0:
-            return np.array([], dtype=np.int16)
-
-        # Resample if needed
-        if sr != target_sr:
-            import librosa
-            audio = librosa.resample(audio, orig_sr=sr, target_sr=target_sr)
-
-        # Normalize to 90% peak (avoid clipping on radio)
-        peak = np.max(np.abs(audio))
-        if peak > 0:
-            audio = audio / peak * 0.9
-
-        return (audio * 32767).astype(np.int16)
+        # The whole utterance isn't known up front, so normalize against the
+        # loudest chunk so far: gain only ever steps down, never pumps up
+        peak = 0.0
+
+        def to_int16(audio: np.ndarray) -> np.ndarray:
+            nonlocal peak
+            # Normalize to 90% peak and scale to int16 in one in-place pass, then
+            # hard-clip so an overshoot can never wrap around into a loud pop
+            peak = max(peak, float(np.max(np.abs(audio))))
+            if peak > 0:
+                np.multiply(audio, 0.9 * 32767 / peak, out=audio)
+            np.clip(audio, -32768, 32767, out=audio)
+            return audio.astype(np.int16, copy=False)
+
+        resampler = None
+        for audio, sr in self.synthesize(text):
+            if sr != target_sr:
+                if resampler is None:
+                    resampler = _StreamResampler(sr, target_sr)
+                audio = resampler.process(audio)
+            if len(audio):
+                yield to_int16(audio)
+
+        if resampler is not None:
+            tail = resampler.process(np.empty(0, dtype=np.float32), final=True)
+            if len(tail):
+                yield to_int16(tail)
+
+
+class _StreamResampler:
+    """
+    Polyphase resampling (e.g. 24 kHz -> 48 kHz is a plain 2x upsample) of
+    consecutive chunks of one signal. Resampling each chunk on its own would
+    zero-pad the filter at every boundary and leave a seam mid-word, so input
+    context is carried across calls and output near the end of the received
+    audio is held back until the samples after it arrive.
+    """
+
+    def __init__(self, sr: int, target_sr: int):
+        g = math.gcd(sr, target_sr)
+        self.up, self.down = target_sr // g, sr // g
+        # resample_poly's default filter reaches 10*max(up, down) samples either
+        # side at the upsampled rate; this many input samples cover it
+        self.pad = -(-10 * max(self.up, self.down) // self.up) + 1
+        self._buf = np.empty(0, dtype=np.float32)
+        self._start = 0    # absolute input index of _buf[0], a multiple of down
+        self._emitted = 0  # absolute output samples returned so far
+
+    def process(self, chunk: np.ndarray, final: bool = False) -> np.ndarray:
+        """Feed the next input chunk; return the output samples now settled."""
+        self._buf = np.concatenate([self._buf, chunk])
+        out = resample_poly(self._buf, self.up, self.down)
+        base = self._start * self.up // self.down  # absolute index of out[0]
+        if final:
+            stop = base + len(out)
+        else:
+            end = self._start + len(self._buf)
+            stop = max(self._emitted, (end - self.pad) * self.up // self.down)
+        out = out[self._emitted - base:stop - base]
+        self._emitted = stop
+
+        # Drop input no longer needed as left context for future output
+        keep = (self._emitted * self.down // self.up - self.pad) // self.down * self.down
+        keep = max(keep, self._start)
+        self._buf = self._buf[keep - self._start:]
+        self._start = keep
+        return out